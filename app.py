@@ -1,7 +1,98 @@
+import hashlib
 import streamlit as st
-from srt_processor import parse_srt_file, create_srt_output, validate_srt_content
-from translator import translate_with_openai, estimate_translation_cost
-from context_manager import ContextManager
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from srt_processor import parse_srt_bytes, create_srt_output
+from prompts import SUPPORTED_LANGUAGES
+
+# translator (and the openai SDK it pulls in) and context_manager are imported where they
+# are first needed, so the first page paint does not wait on them
+if TYPE_CHECKING:
+    from context_manager import ContextManager
+
+# Files with more subtitles than this can be sent through the OpenAI Batch API
+BATCH_API_MIN_TEXTS = 500
+
+# Number of subtitles shown in the translation preview
+PREVIEW_COUNT = 3
+
+
+@st.cache_data(show_spinner=False)
+def _load_srt(raw: bytes) -> Optional[Tuple[Tuple[str, ...], Tuple[str, ...], Tuple[str, ...]]]:
+    """
+    Decode, validate and parse uploaded SRT bytes (cached by file content)
+    
+    Returns:
+        Parallel tuples of (start_times, end_times, texts), or None if the content is not valid SRT
+    """
+    # Decode while parsing so no decoded copy of the whole file is built (the raw bytes are still held)
+    entries = parse_srt_bytes(raw)
+    
+    # Valid SRT has at least one parseable entry
+    first_entry = next(entries, None)
+    if first_entry is None:
+        return None
+    
+    # Columns are stored separately so assembling the output is a single zip()
+    start_times, end_times, texts = zip(first_entry, *entries)
+    return start_times, end_times, texts
+
+
+@st.cache_data(show_spinner=False)
+def _estimate_cost(file_digest: str, target_language: str, model: str, _texts: Tuple[str, ...]) -> Dict:
+    """
+    Cost estimation cached per (file, language, model) so widget reruns skip recomputation
+    
+    The texts themselves are excluded from the cache key (underscore prefix) because the
+    file digest already identifies them, so reruns avoid hashing every subtitle.
+    """
+    from translator import estimate_translation_cost
+    
+    return estimate_translation_cost(list(_texts), target_language, model)
+
+
+@st.cache_data(show_spinner=False)
+def _preview_markdown(start_times: Tuple[str, ...], end_times: Tuple[str, ...],
+                      originals: Tuple[str, ...], translations: Tuple[str, ...]) -> str:
+    """
+    Render the translation preview as one markdown table (cached per preview sample)
+    
+    A single cached markdown element replaces a pair of columns per sample, so unrelated
+    reruns do not rebuild the preview widgets.
+    """
+    rows = ["| Time | Original | Translated |", "| --- | --- | --- |"]
+    for start, end, original, translated in zip(start_times, end_times, originals, translations):
+        # Pipes inside subtitle text would break the table
+        original = original.replace('|', '\\|')
+        translated = translated.replace('|', '\\|')
+        rows.append(f"| **{start} → {end}** | {original} | {translated} |")
+    return "\n".join(rows)
+
+
+def _store_translation(translated_texts: List[str]) -> None:
+    """Build the translated SRT from the parsed entries and mark the translation as completed"""
+    # Create translated SRT content
+    translated_entries = list(zip(st.session_state.start_times, st.session_state.end_times, translated_texts))
+    
+    # Store results; session_state only holds immutable, exactly-sized tuples
+    st.session_state.translated_texts = tuple(translated_texts)
+    st.session_state.translated_srt = create_srt_output(translated_entries)
+    st.session_state.translation_completed = True
+
+
+def _get_context_manager(file_digest: str, target_language: str) -> "ContextManager":
+    """
+    Get the context manager for this file and language, creating it on first use
+    
+    Managers live in session_state so learned terms survive re-translating the same file
+    without being shared between users (unlike st.cache_resource, which is global).
+    """
+    from context_manager import ContextManager
+    
+    key = (file_digest, target_language)
+    if key not in st.session_state.context_managers:
+        st.session_state.context_managers[key] = ContextManager()
+    return st.session_state.context_managers[key]
+
 
 # Page configuration
 st.set_page_config(
@@ -39,6 +130,22 @@ with st.sidebar:
         help="Choose the GPT-5 model for translation."
     )
     
+    # Number of subtitle batches translated at the same time
+    max_workers = st.slider(
+        "Parallel requests",
+        min_value=1,
+        max_value=16,
+        value=4,
+        help="How many subtitle batches are sent to OpenAI at the same time. Lower this if you hit rate limits."
+    )
+    
+    # Asynchronous OpenAI Batch API for large files
+    use_batch_api = st.checkbox(
+        "Use Batch API (cheaper, async)",
+        value=False,
+        help=f"Submit files with more than {BATCH_API_MIN_TEXTS} subtitles as an OpenAI Batch job: about half the cost, but results can take up to 24 hours"
+    )
+    
     st.divider()
     
     # Context Memory settings
@@ -61,6 +168,10 @@ if 'translation_completed' not in st.session_state:
     st.session_state.translation_completed = False
 if 'context_manager' not in st.session_state:
     st.session_state.context_manager = None
+if 'context_managers' not in st.session_state:
+    st.session_state.context_managers = {}
+if 'batch_job' not in st.session_state:
+    st.session_state.batch_job = None
 
 # File upload
 st.subheader("📁 Upload Subtitle File")
@@ -71,17 +182,9 @@ uploaded_file = st.file_uploader(
 
 # Target language selection
 st.subheader("🌍 Target Language")
-languages = [
-    "Chinese (Traditional)",
-    "Chinese (Simplified)", 
-    "Japanese",
-    "Korean",
-    "English"
-]
-
 target_language = st.selectbox(
     "Select target language:",
-    languages
+    SUPPORTED_LANGUAGES
 )
 
 # Process file when uploaded
@@ -89,17 +192,18 @@ if uploaded_file is not None:
     # Only process file once
     if not st.session_state.file_processed or st.session_state.get('current_file') != uploaded_file.name:
         try:
-            # Read and process file
-            file_content = uploaded_file.read().decode('utf-8')
+            # Parse via the cached loader; identical uploads skip validation and parsing
+            raw = uploaded_file.getvalue()
+            loaded = _load_srt(raw)
             
-            if validate_srt_content(file_content):
-                parsed_entries = parse_srt_file(file_content)
-                texts_to_translate = [entry[2] for entry in parsed_entries]
+            if loaded is not None:
+                start_times, end_times, texts_to_translate = loaded
                 
                 # Store in session state
-                st.session_state.file_content = file_content
-                st.session_state.parsed_entries = parsed_entries
+                st.session_state.start_times = start_times
+                st.session_state.end_times = end_times
                 st.session_state.texts_to_translate = texts_to_translate
+                st.session_state.file_digest = hashlib.sha256(raw).hexdigest()
                 st.session_state.current_file = uploaded_file.name
                 st.session_state.file_processed = True
                 st.session_state.translation_completed = False
@@ -118,7 +222,12 @@ if uploaded_file is not None:
 if st.session_state.file_processed:
     
     # Cost estimation
-    cost_info = estimate_translation_cost(st.session_state.texts_to_translate, target_language, selected_model)
+    cost_info = _estimate_cost(
+        st.session_state.file_digest,
+        target_language,
+        selected_model,
+        st.session_state.texts_to_translate
+    )
     
     # Show cost only if significant
     if cost_info['estimated_cost_usd'] > 0.01:
@@ -143,11 +252,34 @@ if not can_translate:
 else:
     translate_button = st.button("🚀 Start Translation", type="primary")
 
+# Large files go through the Batch API when enabled
+use_batch_job = use_batch_api and st.session_state.file_processed and len(st.session_state.texts_to_translate) > BATCH_API_MIN_TEXTS
+
+# Handle Batch API submission
+if translate_button and can_translate and use_batch_job:
+    st.session_state.translation_completed = False
+    
+    try:
+        from translator import submit_batch_translation
+        
+        with st.spinner("Submitting batch job..."):
+            batch_id = submit_batch_translation(
+                list(st.session_state.texts_to_translate),
+                target_language,
+                api_key,
+                selected_model
+            )
+        st.session_state.batch_job = {"id": batch_id, "file": st.session_state.current_file}
+    except Exception as e:
+        st.error(f"Batch submission failed: {str(e)}")
+
 # Handle translation
-if translate_button and can_translate:
+elif translate_button and can_translate:
     st.session_state.translation_completed = False
     
     try:
+        from translator import translate_with_openai
+        
         # Translation process with real-time progress
         with st.spinner("Translating..."):
             progress_bar = st.progress(0)
@@ -156,19 +288,20 @@ if translate_button and can_translate:
             def update_progress(progress):
                 progress_bar.progress(int(progress * 100))
             
-            # Initialize context manager if enabled
+            # Reuse this file's context manager if enabled, keeping terms learned in earlier runs
             context_manager = None
             if use_context_memory:
-                context_manager = ContextManager()
+                context_manager = _get_context_manager(st.session_state.file_digest, target_language)
             
             # Perform translation with progress updates
             translated_texts = translate_with_openai(
-                st.session_state.texts_to_translate, 
+                list(st.session_state.texts_to_translate), 
                 target_language, 
                 api_key, 
                 selected_model,
                 progress_callback=update_progress,
-                context_manager=context_manager
+                context_manager=context_manager,
+                max_workers=max_workers
             )
             
             # Store context manager for potential future use
@@ -177,18 +310,7 @@ if translate_button and can_translate:
             
             progress_bar.progress(100)
             
-            # Create translated SRT content
-            translated_entries = []
-            for i, translated_text in enumerate(translated_texts):
-                start, end, original_text = st.session_state.parsed_entries[i]
-                translated_entries.append((start, end, translated_text))
-            
-            translated_srt = create_srt_output(translated_entries)
-            
-            # Store results
-            st.session_state.translated_texts = translated_texts
-            st.session_state.translated_srt = translated_srt
-            st.session_state.translation_completed = True
+            _store_translation(translated_texts)
             
             # Clear progress
             progress_bar.empty()
@@ -196,6 +318,34 @@ if translate_button and can_translate:
     except Exception as e:
         st.error(f"Translation failed: {str(e)}")
 
+# Show pending Batch API job for the current file
+batch_job = st.session_state.batch_job
+if batch_job and batch_job["file"] == st.session_state.get('current_file'):
+    st.info(f"⏳ Batch job `{batch_job['id']}` submitted. Results can take up to 24 hours.")
+    
+    if st.button("🔄 Check batch status", disabled=not api_key):
+        try:
+            from translator import BATCH_FAILED_STATUSES, collect_batch_translation
+            
+            status, translated_texts = collect_batch_translation(
+                batch_job["id"],
+                list(st.session_state.texts_to_translate),
+                api_key
+            )
+            
+            if translated_texts is not None:
+                _store_translation(translated_texts)
+                st.session_state.batch_job = None
+                st.rerun()
+            elif status in BATCH_FAILED_STATUSES:
+                st.error(f"Batch job {status}. Please start the translation again.")
+                st.session_state.batch_job = None
+            else:
+                st.write(f"**Batch status:** {status}")
+                
+        except Exception as e:
+            st.error(f"Could not check batch status: {str(e)}")
+
 # Show results if translation completed
 if st.session_state.translation_completed:
     # Generate filename
@@ -234,18 +384,9 @@ if st.session_state.translation_completed:
     
     # Show sample results
     with st.expander("Preview translation", expanded=True):
-        sample_count = min(3, len(st.session_state.parsed_entries))
-        for i in range(sample_count):
-            start, end, original = st.session_state.parsed_entries[i]
-            translated = st.session_state.translated_texts[i]
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.write(f"**{start} → {end}**")
-                st.write(original)
-            with col2:
-                st.write("**Translated**")
-                st.write(translated)
-            
-            if i < sample_count - 1:
-                st.divider()
\ No newline at end of file
+        st.markdown(_preview_markdown(
+            st.session_state.start_times[:PREVIEW_COUNT],
+            st.session_state.end_times[:PREVIEW_COUNT],
+            st.session_state.texts_to_translate[:PREVIEW_COUNT],
+            st.session_state.translated_texts[:PREVIEW_COUNT]
+        ))
@@ -6,10 +6,33 @@ proper nouns, character names, and places are translated consistently.
 """
 
 import re
+import sys
 from typing import Dict, List, Tuple
 from collections import Counter
 
 
+# Capitalized words and multi-word phrases (potential proper nouns)
+_CAP_RE = re.compile(r'\b[A-Z][a-zA-Z]{1,}(?:\s+[A-Z][a-zA-Z]*)*\b')
+# Name-like patterns: simple names ("John"), full names ("John Smith") and titles
+_NAME_RE = re.compile(r'^[A-Z][a-z]+$|^[A-Z][a-z]+\s+[A-Z][a-z]+$|^Dr\.|^Mr\.|^Mrs\.|^Ms\.')
+# Chinese/Japanese/Korean characters
+_ASIAN_RE = re.compile(r'[\u4e00-\u9fff\u3400-\u4dbf\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]+')
+# Other non-ASCII characters (European names, etc.)
+_NONASCII_RE = re.compile(r'[^\x00-\x7f]+')
+# Single capitalized words that might be transliterated names
+_SIMPLE_CAP_RE = re.compile(r'\b[A-Z][a-zA-Z]{1,}\b')
+# Punctuation-only strings
+_PUNCT_ONLY_RE = re.compile(r'^[^\w]+$')
+
+# Common English words that shouldn't be treated as proper nouns
+_COMMON_WORDS = frozenset({
+    'I', 'The', 'This', 'That', 'These', 'Those', 'What', 'Where', 'When', 
+    'Who', 'Why', 'How', 'Yes', 'No', 'Ok', 'Okay', 'Well', 'So', 'But',
+    'And', 'Or', 'If', 'Then', 'Now', 'Here', 'There', 'Come', 'Go',
+    'Get', 'Take', 'Give', 'Make', 'Let', 'See', 'Look', 'Good', 'Bad'
+})
+
+
 class ContextManager:
     """
     Manages translation context and terminology consistency across batches
@@ -19,7 +42,10 @@ class ContextManager:
         """Initialize the context manager"""
         self.established_terms: Dict[str, str] = {}  # original -> translation
         self.term_confidence: Dict[str, int] = {}    # original -> confidence_score
-        self.batch_history: List[Dict[str, str]] = []  # history of batch terms
+        # history of batch terms as (originals, translations) tuple pairs
+        self.batch_history: List[Tuple[Tuple[str, ...], Tuple[str, ...]]] = []
+        # Bumped whenever established_terms changes, so callers can tell when a snapshot is stale
+        self.terms_version = 0
         
     def extract_potential_terms(self, texts: List[str]) -> List[str]:
         """
@@ -29,56 +55,49 @@ class ContextManager:
             texts: List of subtitle texts
             
         Returns:
-            List of potential terms (proper nouns, names, places)
+            List of potential terms (proper nouns, names, places), most frequent first
+        """
+        important_terms, _ = self._scan_terms(texts)
+        return important_terms
+    
+    def _scan_terms(self, texts: List[str]) -> Tuple[List[str], Dict[str, int]]:
         """
-        potential_terms = set()
+        Single-pass term extraction that also records where each term first appears
         
-        for text in texts:
-            # Extract capitalized words (potential proper nouns)
-            capitalized_words = re.findall(r'\b[A-Z][a-zA-Z]{1,}(?:\s+[A-Z][a-zA-Z]*)*\b', text)
-            
-            for word in capitalized_words:
+        Returns:
+            Tuple of (important terms, term -> index of the first text containing it)
+        """
+        # Count capitalized words (potential proper nouns) in a single pass
+        term_counter = Counter()
+        first_occurrence: Dict[str, int] = {}
+        for i, text in enumerate(texts):
+            for match in _CAP_RE.finditer(text):
+                word = match.group().strip()
                 # Filter out common sentence starters and short words
-                if len(word) >= 2 and not self._is_common_word(word):
-                    potential_terms.add(word.strip())
+                if len(word) >= 2 and word not in _COMMON_WORDS:
+                    if word not in first_occurrence:
+                        # Names recur constantly; share one string object per term
+                        word = sys.intern(word)
+                        first_occurrence[word] = i
+                    term_counter[word] += 1
+
+        # Keep terms that appear more than once or are likely names, most frequent first
+        important_terms = [
+            term for term, count in term_counter.most_common()
+            if count > 1 or self._is_likely_proper_noun(term)
+        ]
         
-        # Count frequency to identify most important terms
-        term_counter = Counter()
-        for text in texts:
-            for term in potential_terms:
-                if term in text:
-                    term_counter[term] += 1
-        
-        # Return terms that appear more than once or are likely names
-        important_terms = []
-        for term, count in term_counter.items():
-            if count > 1 or self._is_likely_proper_noun(term):
-                important_terms.append(term)
-        
-        return sorted(important_terms)
+        return important_terms, first_occurrence
     
     def _is_common_word(self, word: str) -> bool:
         """Check if word is a common English word that shouldn't be treated as proper noun"""
-        common_words = {
-            'I', 'The', 'This', 'That', 'These', 'Those', 'What', 'Where', 'When', 
-            'Who', 'Why', 'How', 'Yes', 'No', 'Ok', 'Okay', 'Well', 'So', 'But',
-            'And', 'Or', 'If', 'Then', 'Now', 'Here', 'There', 'Come', 'Go',
-            'Get', 'Take', 'Give', 'Make', 'Let', 'See', 'Look', 'Good', 'Bad'
-        }
-        return word in common_words
+        return word in _COMMON_WORDS
     
     def _is_likely_proper_noun(self, word: str) -> bool:
         """Check if word is likely a proper noun based on patterns"""
         # Check for name-like patterns
-        name_patterns = [
-            r'^[A-Z][a-z]+$',  # Simple names like "John", "Mary"
-            r'^[A-Z][a-z]+\s+[A-Z][a-z]+$',  # Full names like "John Smith"
-            r'^Dr\.|^Mr\.|^Mrs\.|^Ms\.', # Titles
-        ]
-        
-        for pattern in name_patterns:
-            if re.match(pattern, word):
-                return True
+        if _NAME_RE.match(word):
+            return True
         
         # Check if it contains multiple capital letters (like place names)
         capital_count = sum(1 for c in word if c.isupper())
@@ -101,25 +120,21 @@ class ContextManager:
         if len(original_texts) != len(translated_texts):
             return {}
         
-        potential_terms = self.extract_potential_terms(original_texts)
+        potential_terms, first_occurrence = self._scan_terms(original_texts)
         term_mappings = {}
         
         for original_term in potential_terms:
-            # Find which subtitle contains this term
-            for i, original_text in enumerate(original_texts):
-                if original_term in original_text:
-                    translated_text = translated_texts[i]
-                    
-                    # Simple heuristic: look for the most frequent non-English characters
-                    # This is a simplified approach - could be enhanced with NLP
-                    translated_candidates = self._extract_translated_candidates(translated_text)
-                    
-                    if translated_candidates:
-                        # Take the first candidate that looks like a proper noun translation
-                        for candidate in translated_candidates:
-                            if self._is_valid_translation_candidate(candidate):
-                                term_mappings[original_term] = candidate
-                                break
+            # Subtitle where this term first appears, found during the scan
+            translated_text = translated_texts[first_occurrence[original_term]]
+            
+            # Simple heuristic: look for the most frequent non-English characters
+            # This is a simplified approach - could be enhanced with NLP
+            translated_candidates = self._extract_translated_candidates(translated_text)
+            
+            # Take the first candidate that looks like a proper noun translation
+            for candidate in translated_candidates:
+                if self._is_valid_translation_candidate(candidate):
+                    term_mappings[original_term] = candidate
                     break
         
         return term_mappings
@@ -130,18 +145,15 @@ class ContextManager:
         candidates = []
         
         # Pattern for Chinese/Japanese/Korean characters
-        asian_pattern = r'[\u4e00-\u9fff\u3400-\u4dbf\u3040-\u309f\u30a0-\u30ff\uac00-\ud7af]+'
-        asian_matches = re.findall(asian_pattern, translated_text)
+        asian_matches = _ASIAN_RE.findall(translated_text)
         candidates.extend(asian_matches)
         
         # Pattern for other non-ASCII characters (European names, etc.)
-        other_pattern = r'[^\x00-\x7f]+'
-        other_matches = re.findall(other_pattern, translated_text)
+        other_matches = _NONASCII_RE.findall(translated_text)
         candidates.extend(other_matches)
         
         # Also look for capitalized words that might be transliterated names
-        cap_pattern = r'\b[A-Z][a-zA-Z]{1,}\b'
-        cap_matches = re.findall(cap_pattern, translated_text)
+        cap_matches = _SIMPLE_CAP_RE.findall(translated_text)
         candidates.extend(cap_matches)
         
         return list(set(candidates))  # Remove duplicates
@@ -153,7 +165,7 @@ class ContextManager:
             return False
         
         # Should not be just punctuation or numbers
-        if re.match(r'^[^\w]+$', candidate):
+        if _PUNCT_ONLY_RE.match(candidate):
             return False
             
         return True
@@ -166,6 +178,10 @@ class ContextManager:
             new_terms: Dictionary of original -> translation mappings
         """
         for original, translation in new_terms.items():
+            # Interned so both term dicts and the batch history share one object per name
+            original = sys.intern(original)
+            translation = sys.intern(translation)
+            
             if original in self.established_terms:
                 # If we already have this term, increase confidence
                 self.term_confidence[original] = self.term_confidence.get(original, 0) + 1
@@ -173,10 +189,14 @@ class ContextManager:
                 # New term
                 self.established_terms[original] = translation
                 self.term_confidence[original] = 1
+                self.terms_version += 1
         
-        # Store batch history
+        # Store batch history compactly as tuples of the interned strings
         if new_terms:
-            self.batch_history.append(new_terms.copy())
+            self.batch_history.append((
+                tuple(map(sys.intern, new_terms)),
+                tuple(map(sys.intern, new_terms.values()))
+            ))
     
     def get_established_terms(self, min_confidence: int = 1) -> Dict[str, str]:
         """
@@ -208,6 +228,7 @@ class ContextManager:
         self.established_terms.clear()
         self.term_confidence.clear()
         self.batch_history.clear()
+        self.terms_version += 1
 
 
 # Utility functions for easy access
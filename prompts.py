@@ -4,7 +4,64 @@ Subtitle Translation Prompts Module
 Centralized management of all translation prompts for consistency and maintainability.
 """
 
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Tuple
+
+
+# Core rules shared by every prompt; formatted once per target language into _BASE_RULES_CACHE
+_BASE_TEMPLATE = """Transform movie subtitles into {target_language} that sounds like locals naturally speaking.
+
+ESSENTIAL RULES:
+1. Use everyday speech patterns - how people really talk
+2. Match the speaker's personality (casual/formal/young/old)
+3. Keep names and places consistent throughout
+4. Sound natural when spoken aloud
+5. Use colloquial expressions native speakers actually use
+
+AVOID: Textbook language, overly formal phrases, awkward literal translations
+
+Make it sound so natural that {target_language} speakers would think it was originally written in their language."""
+
+# Target languages offered by the app; their base rules are formatted at import time
+SUPPORTED_LANGUAGES = (
+    "Chinese (Traditional)",
+    "Chinese (Simplified)",
+    "Japanese",
+    "Korean",
+    "English"
+)
+
+# Other languages are formatted on first use and added here
+_BASE_RULES_CACHE: Dict[str, str] = {
+    language: _BASE_TEMPLATE.format(target_language=language) for language in SUPPORTED_LANGUAGES
+}
+
+# Instruction blocks appended to the base rules; kept as literals so they are built once
+_SINGLE_INSTRUCTIONS = "\n\nReturn ONLY the translation - no explanations."
+
+_BATCH_INSTRUCTIONS = """
+
+BATCH PROCESSING RULES:
+- Maintain dialogue flow and consistency across all subtitles
+- Keep character personalities consistent throughout the batch
+- Preserve context and relationships between consecutive subtitles"""
+
+_CONTEXT_INSTRUCTIONS = """
+
+CONTEXT-AWARE TRANSLATION:
+- Maintain dialogue flow and consistency across all subtitles
+- Keep character personalities consistent throughout the batch
+- Preserve context and relationships between consecutive subtitles"""
+
+_FORMAT_REQUIREMENTS = """
+
+FORMAT REQUIREMENTS:
+- Return each translation on a separate line with the same numbering (1. 2. 3. etc.)
+- Maintain the exact numbering format provided in the input"""
+
+_SINGLE_USER_TEMPLATE = "Translate this movie subtitle to {target_language}:\n\n{text}"
+_BATCH_USER_TEMPLATE = "Translate these consecutive movie subtitles to {target_language}:\n\n{batch_content}"
+_CONTEXT_USER_TEMPLATE = "Translate these consecutive movie subtitles to {target_language}, maintaining consistency with previously established terms:\n\n{batch_content}"
 
 
 class SubtitlePrompts:
@@ -21,18 +78,10 @@ class SubtitlePrompts:
         Returns:
             Core system prompt rules
         """
-        return f"""Transform movie subtitles into {target_language} that sounds like locals naturally speaking.
-
-ESSENTIAL RULES:
-1. Use everyday speech patterns - how people really talk
-2. Match the speaker's personality (casual/formal/young/old)
-3. Keep names and places consistent throughout
-4. Sound natural when spoken aloud
-5. Use colloquial expressions native speakers actually use
-
-AVOID: Textbook language, overly formal phrases, awkward literal translations
-
-Make it sound so natural that {target_language} speakers would think it was originally written in their language."""
+        rules = _BASE_RULES_CACHE.get(target_language)
+        if rules is None:
+            rules = _BASE_RULES_CACHE.setdefault(target_language, _BASE_TEMPLATE.format(target_language=target_language))
+        return rules
 
     @staticmethod
     def get_single_translation_prompt(target_language: str) -> Dict[str, str]:
@@ -45,11 +94,7 @@ Make it sound so natural that {target_language} speakers would think it was orig
         Returns:
             Dictionary with 'system' and 'user_template' prompts
         """
-        system_prompt = SubtitlePrompts.get_base_system_rules(target_language)
-        system_prompt += "\n\nReturn ONLY the translation - no explanations."
-        
-        user_template = "Translate this movie subtitle to {target_language}:\n\n{text}"
-        
+        system_prompt, user_template = _single_translation_prompt(target_language)
         return {
             "system": system_prompt,
             "user_template": user_template
@@ -66,24 +111,7 @@ Make it sound so natural that {target_language} speakers would think it was orig
         Returns:
             Dictionary with 'system' and 'user_template' prompts
         """
-        system_prompt = SubtitlePrompts.get_base_system_rules(target_language)
-        
-        # Add batch-specific instructions
-        batch_instructions = """
-
-BATCH PROCESSING RULES:
-- Maintain dialogue flow and consistency across all subtitles
-- Keep character personalities consistent throughout the batch
-- Preserve context and relationships between consecutive subtitles
-
-FORMAT REQUIREMENTS:
-- Return each translation on a separate line with the same numbering (1. 2. 3. etc.)
-- Maintain the exact numbering format provided in the input"""
-        
-        system_prompt += batch_instructions
-        
-        user_template = "Translate these consecutive movie subtitles to {target_language}:\n\n{batch_content}"
-        
+        system_prompt, user_template = _batch_translation_prompt(target_language)
         return {
             "system": system_prompt,
             "user_template": user_template
@@ -101,40 +129,52 @@ FORMAT REQUIREMENTS:
         Returns:
             Dictionary with 'system' and 'user_template' prompts
         """
-        system_prompt = SubtitlePrompts.get_base_system_rules(target_language)
-        
-        # Add context-aware instructions
-        context_instructions = """
-
-CONTEXT-AWARE TRANSLATION:
-- Maintain dialogue flow and consistency across all subtitles
-- Keep character personalities consistent throughout the batch
-- Preserve context and relationships between consecutive subtitles"""
-        
-        # Add established terms if provided
-        if established_terms:
-            terms_list = [f"- {original} → {translation}" for original, translation in established_terms.items()]
-            context_instructions += f"""
-
-ESTABLISHED TRANSLATIONS (use these exact translations):
-{chr(10).join(terms_list)}"""
-        
-        context_instructions += """
-
-FORMAT REQUIREMENTS:
-- Return each translation on a separate line with the same numbering (1. 2. 3. etc.)
-- Maintain the exact numbering format provided in the input"""
-        
-        system_prompt += context_instructions
-        
-        user_template = "Translate these consecutive movie subtitles to {target_language}, maintaining consistency with previously established terms:\n\n{batch_content}"
-        
+        # Cache on a hashable snapshot of the terms; insertion order is kept so the prompt is unchanged
+        terms_items = tuple(established_terms.items()) if established_terms else ()
+        system_prompt, user_template = _context_aware_batch_prompt(target_language, terms_items)
         return {
             "system": system_prompt,
             "user_template": user_template
         }
 
 
+# Cached prompt builders; the public methods above return fresh dicts built from these
+@lru_cache(maxsize=32)
+def _single_translation_prompt(target_language: str) -> Tuple[str, str]:
+    """Build (system prompt, user template) for single subtitle translation"""
+    system_prompt = SubtitlePrompts.get_base_system_rules(target_language) + _SINGLE_INSTRUCTIONS
+    return system_prompt, _SINGLE_USER_TEMPLATE
+
+
+@lru_cache(maxsize=32)
+def _batch_translation_prompt(target_language: str) -> Tuple[str, str]:
+    """Build (system prompt, user template) for batch subtitle translation"""
+    system_prompt = SubtitlePrompts.get_base_system_rules(target_language) + _BATCH_INSTRUCTIONS + _FORMAT_REQUIREMENTS
+    return system_prompt, _BATCH_USER_TEMPLATE
+
+
+@lru_cache(maxsize=128)
+def _context_aware_batch_prompt(target_language: str, terms_items: Tuple[Tuple[str, str], ...]) -> Tuple[str, str]:
+    """Build (system prompt, user template) for context-aware batch translation"""
+    system_prompt = SubtitlePrompts.get_base_system_rules(target_language) + _CONTEXT_INSTRUCTIONS
+    
+    # Add established terms if provided
+    if terms_items:
+        system_prompt += f"""
+
+ESTABLISHED TRANSLATIONS (use these exact translations):
+{_format_terms(terms_items)}"""
+    
+    system_prompt += _FORMAT_REQUIREMENTS
+    return system_prompt, _CONTEXT_USER_TEMPLATE
+
+
+@lru_cache(maxsize=128)
+def _format_terms(terms_items: Tuple[Tuple[str, str], ...]) -> str:
+    """Format established terms as one "- original → translation" line each"""
+    return "\n".join(f"- {original} → {translation}" for original, translation in terms_items)
+
+
 # Convenience functions for backward compatibility
 def get_single_prompt(target_language: str) -> Dict[str, str]:
     """Get single translation prompt"""
@@ -7,8 +7,8 @@ echo "============================================================"
 source env/bin/activate
 
 echo "📊 Running core functionality tests..."
-cd tests
-python test_all.py
+# Mocked tests only; set PYTEST_WORKERS=auto to spread them over every core with pytest-xdist
+python -m pytest tests -q -m "not slow" -n "${PYTEST_WORKERS:-0}"
 
 echo ""
 echo "🌐 Checking real translation tests..."
@@ -17,7 +17,7 @@ if [ -z "$OPENAI_APIKEY" ]; then
     echo "   To test, run: export OPENAI_APIKEY='your-key'"
 else
     echo "🔄 Running real translation tests..."
-    python test_real_translation.py
+    (cd tests && python test_real_translation.py)
 fi
 
 echo ""
@@ -2,8 +2,15 @@
 SRT subtitle file processing functions
 """
 
+import io
 import re
-from typing import List, Tuple
+from typing import Iterable, Iterator, List, Tuple
+
+
+# Timestamp line at the start of a string, capturing start and end times
+_TIMESTAMP_LINE = re.compile(r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})')
+# Timestamp pair anywhere in the content
+_TIMESTAMP_ANY = re.compile(r'\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}')
 
 
 def parse_srt_file(file_content: str) -> List[Tuple[str, str, str]]:
@@ -21,45 +28,132 @@ def parse_srt_file(file_content: str) -> List[Tuple[str, str, str]]:
         >>> parse_srt_file(content)
         [('00:00:01,000', '00:00:03,000', 'Hello world')]
     """
-    # Split content into blocks (separated by double newlines)
-    blocks = re.split(r'\n\s*\n', file_content.strip())
+    # Single pass over the lines; no intermediate list of blocks
+    return list(parse_srt_stream(file_content.split('\n')))
+
+
+def parse_srt_file_soa(file_content: str) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Parse SRT content into parallel columns instead of one tuple per entry.
     
-    parsed_entries = []
+    Only three lists are kept alive, which is lighter for large files and lets callers
+    batch the texts by slicing.
     
-    for block in blocks:
-        if not block.strip():
+    Args:
+        file_content (str): The content of the SRT file as a string
+        
+    Returns:
+        Tuple[List[str], List[str], List[str]]: (start_times, end_times, texts)
+        
+    Example:
+        >>> parse_srt_file_soa("1\\n00:00:01,000 --> 00:00:03,000\\nHello world\\n")
+        (['00:00:01,000'], ['00:00:03,000'], ['Hello world'])
+    """
+    start_times, end_times, texts = [], [], []
+    add_start, add_end, add_text = start_times.append, end_times.append, texts.append
+    
+    for start_time, end_time, text in parse_srt_stream(file_content.split('\n')):
+        add_start(start_time)
+        add_end(end_time)
+        add_text(text)
+    
+    return start_times, end_times, texts
+
+
+# Line scanner states
+_EXPECT_INDEX = 0       # waiting for a block's sequence number
+_EXPECT_TS = 1          # sequence number seen, waiting for the timestamp line
+_EXPECT_FIRST_TEXT = 2  # timestamp seen, waiting for the first text line
+_EXPECT_TEXT = 3        # collecting subtitle text lines
+_SKIP_BLOCK = 4         # invalid block, ignore lines until the next blank line
+
+
+def parse_srt_stream(stream: Iterable[str]) -> Iterator[Tuple[str, str, str]]:
+    """
+    Lazily parse SRT content from a line iterator (e.g. a text file or io.TextIOWrapper).
+    
+    Lines are consumed by a small state machine, so only the current subtitle's text is
+    held in memory and large files can be parsed without first decoding them into a
+    single string. parse_srt_file is a thin wrapper around this.
+    
+    Args:
+        stream (Iterable[str]): Lines of SRT content
+        
+    Yields:
+        Tuple[str, str, str]: (start_time, end_time, text) for each valid entry
+        
+    Example:
+        >>> list(parse_srt_stream(io.StringIO("1\\n00:00:01,000 --> 00:00:03,000\\nHello world\\n")))
+        [('00:00:01,000', '00:00:03,000', 'Hello world')]
+    """
+    state = _EXPECT_INDEX
+    start_time = end_time = ''
+    text_parts = []
+    
+    for line in stream:
+        line = line.rstrip('\r\n')
+        
+        # Blank line ends the current block (isspace() avoids building a stripped copy)
+        if not line or line.isspace():
+            if state == _EXPECT_TEXT:
+                # Only the outer ends need trimming: the first part was lstripped on
+                # append, and text lines are never blank, so the text is never empty
+                text_parts[-1] = text_parts[-1].rstrip()
+                yield (start_time, end_time, ' '.join(text_parts))
+            state = _EXPECT_INDEX
             continue
-            
-        lines = block.strip().split('\n')
-        
-        if len(lines) < 3:
-            continue  # Invalid block, skip
-            
-        # First line should be the sequence number
-        try:
-            sequence_num = int(lines[0])
-        except ValueError:
-            continue  # Skip if first line is not a number
-            
-        # Second line should contain timestamps
-        timestamp_line = lines[1]
-        timestamp_pattern = r'(\d{2}:\d{2}:\d{2},\d{3})\s*-->\s*(\d{2}:\d{2}:\d{2},\d{3})'
-        timestamp_match = re.match(timestamp_pattern, timestamp_line)
-        
-        if not timestamp_match:
-            continue  # Skip if timestamp format is invalid
-            
-        start_time = timestamp_match.group(1)
-        end_time = timestamp_match.group(2)
-        
-        # Remaining lines are the subtitle text
-        text_lines = lines[2:]
-        text = ' '.join(text_lines).strip()
-        
-        if text:  # Only add non-empty text
-            parsed_entries.append((start_time, end_time, text))
-    
-    return parsed_entries
+        
+        if state == _EXPECT_INDEX:
+            # First line should be the sequence number (its value is never used); like int(),
+            # allow one leading sign but only decimal digits (isdigit() would accept '²')
+            index = line.strip()
+            if index[:1] in ('+', '-'):
+                index = index[1:]
+            if index.isdecimal():
+                state = _EXPECT_TS
+            else:
+                state = _SKIP_BLOCK  # Skip if first line is not a number
+        
+        elif state == _EXPECT_TS:
+            # Second line should contain timestamps
+            timestamp_match = _TIMESTAMP_LINE.match(line)
+            if timestamp_match:
+                start_time, end_time = timestamp_match.groups()
+                text_parts = []
+                state = _EXPECT_FIRST_TEXT
+            else:
+                state = _SKIP_BLOCK  # Skip if timestamp format is invalid
+        
+        elif state == _EXPECT_FIRST_TEXT:
+            # First text line; only now does the block become an entry
+            text_parts.append(line.lstrip())
+            state = _EXPECT_TEXT
+        
+        elif state == _EXPECT_TEXT:
+            # Remaining lines are the subtitle text
+            text_parts.append(line)
+    
+    # Last block may not be followed by a blank line
+    if state == _EXPECT_TEXT:
+        text_parts[-1] = text_parts[-1].rstrip()
+        yield (start_time, end_time, ' '.join(text_parts))
+
+
+def parse_srt_bytes(raw: bytes) -> Iterator[Tuple[str, str, str]]:
+    """
+    Lazily parse undecoded SRT bytes (e.g. an uploaded file), decoding while parsing.
+    
+    Lines are split on '\\n' only, the same line splitting as parse_srt_file; a stray '\\r'
+    stays in its line instead of starting a new one. Unlike parse_srt_file, a leading UTF-8
+    BOM is dropped so it cannot hide the first sequence number.
+    
+    Args:
+        raw (bytes): UTF-8 encoded SRT content
+        
+    Yields:
+        Tuple[str, str, str]: (start_time, end_time, text) for each valid entry
+    """
+    return parse_srt_stream(io.TextIOWrapper(io.BytesIO(raw), encoding='utf-8-sig', newline='\n'))
 
 
 def create_srt_output(translated_entries: List[Tuple[str, str, str]]) -> str:
@@ -71,24 +165,44 @@ def create_srt_output(translated_entries: List[Tuple[str, str, str]]) -> str:
                                                         (start_time, end_time, text)
         
     Returns:
-        str: Complete SRT subtitle content as string
+        str: Complete SRT subtitle content as string, with an empty line between blocks
+             and a single newline after the last one
         
     Example:
         >>> entries = [('00:00:01,000', '00:00:03,000', 'Hello world')]
         >>> create_srt_output(entries)
-        '1\\n00:00:01,000 --> 00:00:03,000\\nHello world\\n\\n'
+        '1\\n00:00:01,000 --> 00:00:03,000\\nHello world\\n'
     """
-    srt_blocks = []
-    
-    for i, (start_time, end_time, text) in enumerate(translated_entries, 1):
-        # Create each SRT block
-        block = f"{i}\n{start_time} --> {end_time}\n{text}\n"
-        srt_blocks.append(block)
+    # Create each SRT block in one comprehension (no per-entry append calls)
+    srt_blocks = [
+        f"{i}\n{start_time} --> {end_time}\n{text}\n"
+        for i, (start_time, end_time, text) in enumerate(translated_entries, 1)
+    ]
     
     # Join all blocks with empty lines between them
     return '\n'.join(srt_blocks)
 
 
+def iter_srt_output(translated_entries: Iterable[Tuple[str, str, str]]) -> Iterator[str]:
+    """
+    Yield SRT output one subtitle block at a time.
+    
+    Produces exactly the same text as create_srt_output without building the whole file
+    in memory, e.g. ``f.writelines(iter_srt_output(entries))``.
+    
+    Args:
+        translated_entries (Iterable[Tuple[str, str, str]]): (start_time, end_time, text) entries
+        
+    Yields:
+        str: One SRT block, preceded by the empty separator line for all but the first
+    """
+    for i, (start_time, end_time, text) in enumerate(translated_entries, 1):
+        if i == 1:
+            yield f"{i}\n{start_time} --> {end_time}\n{text}\n"
+        else:
+            yield f"\n{i}\n{start_time} --> {end_time}\n{text}\n"
+
+
 def validate_srt_content(file_content: str) -> bool:
     """
     Validate if the content appears to be a valid SRT file.
@@ -99,16 +213,23 @@ def validate_srt_content(file_content: str) -> bool:
     Returns:
         bool: True if content appears to be valid SRT format
     """
-    # Check for basic SRT patterns
-    timestamp_pattern = r'\d{2}:\d{2}:\d{2},\d{3}\s*-->\s*\d{2}:\d{2}:\d{2},\d{3}'
-    
     # Look for at least one timestamp pattern
-    if not re.search(timestamp_pattern, file_content):
+    if not _TIMESTAMP_ANY.search(file_content):
         return False
     
-    # Check if we can parse at least one entry
-    try:
-        entries = parse_srt_file(file_content)
-        return len(entries) > 0
-    except Exception:
-        return False
+    # Check if we can parse at least one entry; lines are sliced out lazily, so only the
+    # content up to the first valid block is scanned (and nothing is copied up front)
+    first_entry = next(parse_srt_stream(_iter_lines(file_content)), None)
+    return first_entry is not None
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Lazily yield the lines of text split on '\\n', the same lines as text.split('\\n')"""
+    start = 0
+    while True:
+        end = text.find('\n', start)
+        if end < 0:
+            yield text[start:]
+            return
+        yield text[start:end]
+        start = end + 1
@@ -0,0 +1,66 @@
+"""
+pytest configuration for the OpenSubTrans test suite
+
+Every TestCase in test_all.py is self-contained (each test builds its own
+ContextManager and mocks), so the suite can be spread across processes with:
+
+    pytest -n auto tests/test_all.py
+
+Tests in test_real_translation.py call the real OpenAI API and are marked
+``slow``; deselect them with ``-m "not slow"``.
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+
+import pytest
+
+# Make the project modules importable no matter where pytest is started from
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Project modules whose functools.lru_cache wrappers are cleared between tests
+_PROJECT_MODULES = ("srt_processor", "prompts", "context_manager", "translator")
+
+# Test modules that talk to the real OpenAI API
+_REAL_API_MODULES = frozenset({"test_real_translation.py"})
+
+
+def pytest_configure(config):
+    """Register the markers used by this suite"""
+    config.addinivalue_line("markers", "slow: calls the real OpenAI API (deselect with '-m \"not slow\"')")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Mark every test in the real-API modules as slow"""
+    slow = pytest.mark.slow
+    for item in items:
+        if item.path.name in _REAL_API_MODULES:
+            item.add_marker(slow)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def preload_project_modules():
+    """Import the modules under test once per worker instead of inside the first test"""
+    for name in ("srt_processor", "prompts", "context_manager"):
+        importlib.import_module(name)
+    # translator loads the openai SDK lazily; the mocked tests need it anyway and it is the
+    # bulk of the import cost, so load both up front
+    if importlib.util.find_spec("openai") is not None:
+        for name in ("openai", "translator"):
+            importlib.import_module(name)
+
+
+@pytest.fixture(autouse=True)
+def clear_lru_caches():
+    """Clear the project's lru_cache'd functions after each test so nothing cached under one test's mocks leaks into the next"""
+    yield
+    for name in _PROJECT_MODULES:
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        for obj in vars(module).values():
+            cache_clear = getattr(obj, "cache_clear", None)
+            if cache_clear is not None:
+                cache_clear()
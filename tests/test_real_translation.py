@@ -4,22 +4,35 @@ Real-world test of GPT-5 translation functionality
 This script uses actual OpenAI API to test translation
 """
 
+import functools
 import os
 import sys
+import unittest
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from srt_processor import parse_srt_file, create_srt_output, validate_srt_content
+from srt_processor import parse_srt_file, iter_srt_output, validate_srt_content
 from translator import translate_with_openai, estimate_translation_cost
 
+# Read once per process; every test uses the same key
+OPENAI_APIKEY = os.getenv('OPENAI_APIKEY')
+SAMPLE_SRT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sample_subtitle.srt')
 
-def test_real_translation():
-    """Test actual translation with OpenAI API"""
+
+@functools.lru_cache(maxsize=1)
+def _load_sample():
+    """Read and decode the sample subtitle file once per process"""
+    with open(SAMPLE_SRT_PATH, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def run_real_translation():
+    """Test actual translation with OpenAI API; returns True on success"""
     
     print("🧪 Testing Real OpenAI Translation")
     print("=" * 50)
     
     # Check API key
-    api_key = os.getenv('OPENAI_APIKEY')
+    api_key = OPENAI_APIKEY
     if not api_key:
         print("❌ No OPENAI_APIKEY environment variable found!")
         print("Please set it with: export OPENAI_APIKEY='your-api-key-here'")
@@ -29,11 +42,10 @@ def test_real_translation():
     
     # Load sample subtitle file
     try:
-        with open('sample_subtitle.srt', 'r', encoding='utf-8') as f:
-            srt_content = f.read()
+        srt_content = _load_sample()
         print("✅ Sample subtitle file loaded")
     except FileNotFoundError:
-        print("❌ Sample subtitle file not found at sample_subtitle.srt")
+        print(f"❌ Sample subtitle file not found at {SAMPLE_SRT_PATH}")
         return False
     
     # Validate and parse SRT
@@ -104,12 +116,10 @@ def test_real_translation():
         for i in range(len(translated_texts), len(parsed_entries)):
             translated_entries.append(parsed_entries[i])
         
-        translated_srt = create_srt_output(translated_entries)
-        
-        # Save translated file
+        # Save translated file, streaming blocks instead of building the whole SRT string
         output_filename = f"tests/translated_sample_{target_language.replace(' ', '_').replace('(', '').replace(')', '').lower()}.srt"
         with open(output_filename, 'w', encoding='utf-8') as f:
-            f.write(translated_srt)
+            f.writelines(iter_srt_output(translated_entries))
         
         print(f"💾 Translated SRT saved to: {output_filename}")
         
@@ -120,13 +130,13 @@ def test_real_translation():
         return False
 
 
-def test_different_languages():
-    """Test translation to different languages with small samples"""
+def run_different_languages():
+    """Test translation to different languages with small samples; returns True on success"""
     
     print("\n\n🌍 Testing Multiple Languages")
     print("=" * 50)
     
-    api_key = os.getenv('OPENAI_APIKEY')
+    api_key = OPENAI_APIKEY
     if not api_key:
         print("❌ No API key available")
         return False
@@ -158,6 +168,24 @@ def test_different_languages():
     return True
 
 
+def _require_api_key():
+    """Skip the calling test when no API key is configured (pytest treats unittest.SkipTest as a skip)"""
+    if not OPENAI_APIKEY:
+        raise unittest.SkipTest("OPENAI_APIKEY is not set")
+
+
+def test_real_translation():
+    """pytest entry point for run_real_translation"""
+    _require_api_key()
+    assert run_real_translation()
+
+
+def test_different_languages():
+    """pytest entry point for run_different_languages"""
+    _require_api_key()
+    assert run_different_languages()
+
+
 def main():
     """Run all real translation tests"""
     print("🚀 OpenSubTrans Real Translation Testing")
@@ -169,14 +197,14 @@ def main():
     success = True
     
     # Test main translation functionality
-    if not test_real_translation():
+    if not run_real_translation():
         success = False
     
     # Test multiple languages (comment out to save API costs)
     print("\n" + "="*60)
     print("🔄 Want to test multiple languages? (This will use more API calls)")
     print("Uncommenting the line below will test 4 different languages...")
-    # if not test_different_languages():
+    # if not run_different_languages():
     #     success = False
     
     print("\n" + "="*60)
@@ -2,20 +2,64 @@
 OpenAI translation module for subtitle translation using GPT-5
 """
 
-import openai
+import atexit
+import functools
+import json
+import re
 import time
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import nullcontext
+import weakref
+from types import MappingProxyType
+from typing import TYPE_CHECKING, List, Dict, Mapping, Optional, Tuple, Union
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 from prompts import SubtitlePrompts
 from context_manager import ContextManager
 
+# The openai SDK takes about half a second to import, so it is imported inside the functions
+# that call the API; estimate_translation_cost never has to load it
+if TYPE_CHECKING:
+    import openai
 
-def translate_with_openai(text_list: List[str], target_language: str, api_key: str, model: str = "gpt-5-mini", progress_callback=None, context_manager: ContextManager = None) -> List[str]:
+logger = logging.getLogger(__name__)
+
+
+# Character budget per batch request (~1500 input tokens at ~4 characters per token)
+_BATCH_MAX_CHARS = 6000
+
+# Default API budgets shared by a translation's concurrent requests, and the allowance for the
+# system prompt and numbering when estimating a request's tokens
+_REQUESTS_PER_MINUTE = 500
+_TOKENS_PER_MINUTE = 200_000
+_PROMPT_TOKENS = 500
+
+# Lines made only of symbols, digits and punctuation ("♪ ♪", "...", "1984"), which need no translation
+_UNTRANSLATABLE = re.compile(r'[\W\d_]+')
+
+# Batch API job states that will never produce results (also used by the app's status check)
+BATCH_FAILED_STATUSES = frozenset({"failed", "expired", "cancelled"})
+
+# Supported GPT-5 models, in the order they are listed in error messages
+_SUPPORTED_MODELS = ('gpt-5', 'gpt-5-mini')
+
+# Pricing for supported GPT-5 models (Updated January 2025)
+# Prices are per 1K tokens (converted from per million tokens)
+_PRICING_MAP = {
+    "gpt-5": {"input": 0.00125, "output": 0.01},        # $1.25/$10.00 per million
+    "gpt-5-mini": {"input": 0.00025, "output": 0.002},  # $0.25/$2.00 per million
+}
+
+
+def translate_with_openai(text_list: List[str], target_language: str, api_key: str, model: str = "gpt-5-mini", progress_callback=None, context_manager: ContextManager = None, batch_size: int = 12, max_workers: int = 4) -> List[str]:
     """
     Translate a list of texts using smart batch processing for better consistency
     
-    This function automatically groups texts into batches of ~12 for improved dialogue
-    coherence and efficiency, while maintaining proper nouns consistency.
+    This function automatically groups texts into batches (up to 12 by default, fewer when the
+    lines are long) for improved dialogue coherence and efficiency, while maintaining proper nouns consistency. Batches are sent
+    concurrently (up to max_workers at a time) and reassembled in input order. Repeated
+    subtitles are sent only once and their translation is copied to every position.
     
     Args:
         text_list (List[str]): List of text strings to translate
@@ -24,6 +68,8 @@ def translate_with_openai(text_list: List[str], target_language: str, api_key: s
         model (str): GPT-5 model to use (default: gpt-5-mini)
         progress_callback (callable, optional): Function to call with progress updates (0.0 to 1.0)
         context_manager (ContextManager, optional): Context manager for terminology consistency
+        batch_size (int): Maximum number of subtitles sent per API call (default: 12)
+        max_workers (int): Maximum number of batches translated concurrently (default: 4)
         
     Returns:
         List[str]: List of translated texts in the same order as input
@@ -35,9 +81,8 @@ def translate_with_openai(text_list: List[str], target_language: str, api_key: s
     
     # Input validation
     # Validate model is one of the supported GPT-5 models
-    supported_models = ['gpt-5', 'gpt-5-mini']
-    if model not in supported_models:
-        raise ValueError(f"Only these GPT-5 models are supported: {supported_models}. Got: {model}")
+    if model not in _SUPPORTED_MODELS:
+        raise ValueError(f"Only these GPT-5 models are supported: {list(_SUPPORTED_MODELS)}. Got: {model}")
     
     if not api_key or not api_key.strip():
         raise ValueError("API key cannot be empty")
@@ -48,85 +93,99 @@ def translate_with_openai(text_list: List[str], target_language: str, api_key: s
     if not isinstance(text_list, list):
         raise ValueError("text_list must be a list")
     
+    if not isinstance(batch_size, int) or batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    
+    if not isinstance(max_workers, int) or max_workers < 1:
+        raise ValueError("max_workers must be a positive integer")
+    
     if not text_list:
         return []
     
-    # Filter out empty strings but keep track of original positions
-    non_empty_texts = []
-    text_positions = []
+    # Filter out empty strings, untranslatable lines and repeats, keeping track of what each position needs
+    non_empty_texts, text_slots = _collect_non_empty(text_list)
     
-    for i, text in enumerate(text_list):
-        if text and text.strip():
-            non_empty_texts.append(text.strip())
-            text_positions.append(i)
-    
-    # If no non-empty texts, return list of empty strings
+    # If nothing needs translating, return the empty and untranslatable texts as they are
     if not non_empty_texts:
-        return [""] * len(text_list)
+        return _spread_translations([], text_slots)
+    
+    import openai
     
     try:
-        # Initialize OpenAI client
-        client = openai.OpenAI(api_key=api_key)
+        # Shared OpenAI client for this API key, so its pooled connections are reused across calls
+        client = _get_client(api_key)
         
         # Smart batch translation for better consistency and efficiency
-        all_translations = []
-        batch_size = 12  # Optimal batch size for dialogue coherence
+        batches = _pack_batches(non_empty_texts, batch_size)
+        # Index of each batch's first text (for logging)
+        batch_starts = [0] * len(batches)
+        for i in range(1, len(batches)):
+            batch_starts[i] = batch_starts[i - 1] + len(batches[i - 1])
+        batch_results: List[Optional[List[str]]] = [None] * len(batches)
+        completed_texts = 0
+        
+        # Keep request starts within the API key's per-minute limits (shared by every call using the key)
+        pacer = _get_pacer(api_key)
         
-        # Get established terms for context-aware translation
-        established_terms = {}
+        # Get established terms for context-aware translation. Batches share this read-only
+        # snapshot, which is only replaced when the context manager's terms change
+        established_terms = MappingProxyType({})
+        terms_version = None
         if context_manager:
-            established_terms = context_manager.get_established_terms()
+            established_terms = MappingProxyType(context_manager.get_established_terms())
+            terms_version = context_manager.terms_version
         
-        # Process texts in batches
-        for i in range(0, len(non_empty_texts), batch_size):
-            batch_texts = non_empty_texts[i:i + batch_size]
+        def record_batch(index: int, batch_translations: List[str]) -> None:
+            """Store a finished batch, learn its terms and report progress (runs on the calling thread)"""
+            nonlocal completed_texts, established_terms, terms_version
+            batch_results[index] = batch_translations
             
-            try:
-                # Translate the batch with context awareness
-                batch_translations = _translate_batch(client, batch_texts, target_language, model, established_terms)
-                all_translations.extend(batch_translations)
-                
-                # Update context manager with new translations if available
-                if context_manager and batch_translations:
-                    new_terms = context_manager.extract_terms_from_translation_pair(batch_texts, batch_translations)
-                    if new_terms:
-                        context_manager.update_terms(new_terms)
-                        # Update established terms for next batch
-                        established_terms.update(new_terms)
-                
-                # Update progress
-                if progress_callback:
-                    progress = min(1.0, (i + batch_size) / len(non_empty_texts))
-                    progress_callback(progress)
+            # Update context manager with new translations if available
+            if context_manager and batch_translations:
+                new_terms = context_manager.extract_terms_from_translation_pair(batches[index], batch_translations)
+                if new_terms:
+                    context_manager.update_terms(new_terms)
+                # Re-snapshot for batches dispatched later only if a term was actually added
+                if context_manager.terms_version != terms_version:
+                    established_terms = MappingProxyType(context_manager.get_established_terms())
+                    terms_version = context_manager.terms_version
+            
+            # Update progress
+            completed_texts += len(batches[index])
+            if progress_callback:
+                progress_callback(min(1.0, completed_texts / len(non_empty_texts)))
+        
+        next_batch = 0
+        
+        # Caps requests in flight across the batch pool and the batches' fallback pools at max_workers
+        in_flight = threading.BoundedSemaphore(max_workers)
+        
+        # With context memory, translate the first batch alone so later batches start with seeded terms
+        if context_manager:
+            record_batch(0, _translate_batch_with_fallback(client, batches[0], target_language, model, established_terms, pacer, 0, in_flight, max_workers))
+            next_batch = 1
+        
+        # Translate remaining batches concurrently (I/O-bound, so threads are sufficient)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {}
+            while next_batch < len(batches) or pending:
+                # Keep at most max_workers batches in flight; each sees the terms learned so far
+                while next_batch < len(batches) and len(pending) < max_workers:
+                    future = executor.submit(
+                        _translate_batch_with_fallback, client, batches[next_batch], target_language,
+                        model, established_terms, pacer, batch_starts[next_batch], in_flight, max_workers
+                    )
+                    pending[future] = next_batch
+                    next_batch += 1
                 
-                # Brief pause between batches to respect API limits
-                if i + batch_size < len(non_empty_texts):
-                    time.sleep(0.2)
-                    
-            except Exception as e:
-                logging.error(f"Batch translation failed for batch starting at {i}: {str(e)}")
-                # Fallback to individual translation for this batch
-                for j, text in enumerate(batch_texts):
-                    try:
-                        translated_text = _translate_single(client, text, target_language, model)
-                        all_translations.append(translated_text)
-                    except Exception as single_e:
-                        logging.error(f"Failed to translate text '{text}': {str(single_e)}")
-                        all_translations.append(text)  # Use original text if all fails
-                    
-                    # Update progress even in fallback mode
-                    if progress_callback:
-                        current_completed = i + j + 1
-                        progress = min(1.0, current_completed / len(non_empty_texts))
-                        progress_callback(progress)
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    record_batch(pending.pop(future), future.result())
         
-        # Reconstruct the full result list
-        result = [""] * len(text_list)
-        for i, translation in enumerate(all_translations):
-            original_position = text_positions[i]
-            result[original_position] = translation
+        all_translations = [translation for batch in batch_results for translation in batch]
         
-        return result
+        # Reconstruct the full result list
+        return _spread_translations(all_translations, text_slots)
         
     except openai.AuthenticationError as e:
         raise openai.AuthenticationError(f"Invalid API key: {str(e)}")
@@ -138,7 +197,278 @@ def translate_with_openai(text_list: List[str], target_language: str, api_key: s
         raise Exception(f"Unexpected error during translation: {str(e)}")
 
 
-def _translate_single(client: openai.OpenAI, text: str, target_language: str, model: str) -> str:
+def _collect_non_empty(text_list: List[str]) -> Tuple[List[str], List[Union[int, str]]]:
+    """
+    Strip texts and drop empty ones, untranslatable ones and repeats, keeping track of where each text goes
+    
+    Subtitles repeat a lot ("Yes.", "What?"), so each distinct text is translated only once.
+    Lines with nothing to translate ("♪", "...", "1984") are never sent to the API.
+    
+    Returns:
+        Tuple of (non_empty_texts, text_slots), where non_empty_texts holds each distinct
+        stripped text once (in first-seen order) and text_slots[i] is the index of
+        text_list[i] in non_empty_texts, or the output text itself ("" for empty texts)
+        when it needs no translation
+    """
+    slot_of = {}
+    text_slots = []
+    
+    for text in text_list:
+        text = text.strip() if text else ""
+        if not text or _UNTRANSLATABLE.fullmatch(text):
+            text_slots.append(text)
+        else:
+            text_slots.append(slot_of.setdefault(text, len(slot_of)))
+    
+    return list(slot_of), text_slots
+
+
+def _pack_batches(texts: List[str], batch_size: int, max_chars: int = _BATCH_MAX_CHARS) -> List[List[str]]:
+    """
+    Greedily group texts into batches of at most batch_size texts and about max_chars characters
+    
+    Long monologues end a batch early so one request does not grow large enough to time out or
+    get truncated; a single text longer than max_chars still gets a batch of its own.
+    """
+    batches = []
+    current = []
+    current_chars = 0
+    
+    for text in texts:
+        if current and (len(current) >= batch_size or current_chars + len(text) > max_chars):
+            batches.append(current)
+            current = []
+            current_chars = 0
+        current.append(text)
+        current_chars += len(text)
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _spread_translations(translations: List[str], text_slots: List[Union[int, str]]) -> List[str]:
+    """Map translations of the distinct texts back onto every original position"""
+    return [translations[slot] if isinstance(slot, int) else slot for slot in text_slots]
+
+
+def _estimate_request_tokens(texts: List[str]) -> int:
+    """Rough input plus output tokens for translating texts (same 3 characters per token as the cost estimate)"""
+    return _PROMPT_TOKENS + 2 * (sum(map(len, texts)) // 3)
+
+
+def _count_non_empty(text_list: List[str]) -> Tuple[int, int]:
+    """Return (total characters, number of texts) over the texts that are not blank"""
+    total_chars = 0
+    total_texts = 0
+    for text in text_list:
+        if text and not text.isspace():
+            total_chars += len(text)
+            total_texts += 1
+    return total_chars, total_texts
+
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket: refills at rate units per second and holds at most capacity units
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = time.monotonic()
+    
+    def wait(self, amount: float = 1.0) -> None:
+        """Block until amount units are available, then take them"""
+        # amount may exceed capacity; the request is still charged in full and waits out the deficit
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # Take the units up front, going into debt if needed, so waiters are served in arrival order
+            self._tokens -= amount
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        
+        if delay > 0:
+            time.sleep(delay)
+
+
+class _RequestPacer:
+    """
+    Thread-safe limiter that keeps API requests within per-minute request and token budgets
+    
+    Requests start immediately while there is budget left and only wait once it runs out,
+    instead of always pausing between requests.
+    """
+    
+    def __init__(self, requests_per_minute: float = _REQUESTS_PER_MINUTE, tokens_per_minute: float = _TOKENS_PER_MINUTE):
+        # Each bucket holds one second's worth of budget, so bursts stay short
+        self._requests = _TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute / 60))
+        self._tokens = _TokenBucket(tokens_per_minute / 60, tokens_per_minute / 60)
+    
+    def wait(self, texts: List[str]) -> None:
+        """Block until a request translating texts may start"""
+        self._requests.wait()
+        self._tokens.wait(_estimate_request_tokens(texts))
+
+
+# Guards _get_pacer so concurrent sessions using the same API key cannot end up with two pacers
+_PACER_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_pacer(api_key: str) -> _RequestPacer:
+    """Create the request pacer for an API key (call through _get_pacer)"""
+    return _RequestPacer()
+
+
+def _get_pacer(api_key: str) -> _RequestPacer:
+    """Return the request pacer shared by every call using an API key, since its quota is per account"""
+    with _PACER_LOCK:
+        return _cached_pacer(api_key)
+
+
+# A numbered line in a batch response: "<n>. translation" or "<n>) translation"
+_NUMBERED_LINE = re.compile(r'^[^\S\n]*([1-9][0-9]*)[.)](.*)$', re.MULTILINE)
+
+# Exponential backoff between retried attempts when the API gives no Retry-After
+_RATE_LIMIT_BACKOFF = wait_exponential(multiplier=1, min=1, max=30)
+
+
+# Clients created by _cached_client, closed at interpreter exit (evicted clients drop out on their own)
+_OPEN_CLIENTS = weakref.WeakSet()
+
+# Guards _get_client so concurrent sessions using the same API key cannot end up with two clients
+_CLIENT_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_client(api_key: str) -> "openai.OpenAI":
+    """Create the OpenAI client for an API key (call through _get_client)"""
+    import openai
+    client = openai.OpenAI(api_key=api_key, max_retries=0)
+    _OPEN_CLIENTS.add(client)
+    return client
+
+
+def _get_client(api_key: str) -> "openai.OpenAI":
+    """
+    Return the shared OpenAI client for an API key, creating it on first use
+    
+    Reusing one client keeps its connection pool (and TLS sessions) warm across translations
+    and Batch API calls. SDK retries are disabled because every API call goes through
+    _create_chat_completion or _call_api, which retry transient failures themselves; left on,
+    the two would multiply each other's attempts.
+    
+    Only clients still alive at exit are closed there. A client evicted from the cache is not
+    closed on eviction, since another call may still be using it; its connections are released
+    when it is garbage collected.
+    """
+    with _CLIENT_LOCK:
+        return _cached_client(api_key)
+
+
+@atexit.register
+def _close_clients() -> None:
+    """Release the shared clients' pooled connections"""
+    for client in list(_OPEN_CLIENTS):
+        client.close()
+
+
+def _is_retryable_error(error: BaseException) -> bool:
+    """Whether an API call failed transiently: rate limiting, a dropped connection or a server error (openai is loaded once a client exists)"""
+    import openai
+    return isinstance(error, (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError))
+
+
+def _wait_before_retry(retry_state) -> float:
+    """Wait as long as the error response's Retry-After header asks, else back off exponentially"""
+    error = retry_state.outcome.exception()
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(max(float(retry_after), 0.0), 30.0)
+    except (TypeError, ValueError):
+        return _RATE_LIMIT_BACKOFF(retry_state)
+
+
+# Retry policy for every API call made with the shared clients (which have SDK retries off)
+_retry_transient = retry(
+    retry=retry_if_exception(_is_retryable_error),
+    wait=_wait_before_retry,
+    stop=stop_after_attempt(5),
+    reraise=True
+)
+
+
+@_retry_transient
+def _create_chat_completion(client: "openai.OpenAI", pacer: Optional[_RequestPacer] = None, request_texts: List[str] = (), **api_params):
+    """
+    Call the Chat Completions API, retrying requests rejected by rate limiting or lost to transient failures
+    
+    Every attempt, retries included, first waits for the pacer, charged for request_texts.
+    """
+    if pacer is not None:
+        pacer.wait(request_texts)
+    return client.chat.completions.create(**api_params)
+
+
+@_retry_transient
+def _call_api(method, *args, **kwargs):
+    """Call a client method (Files and Batches API), retrying rate-limited and transient failures"""
+    return method(*args, **kwargs)
+
+
+def _translate_batch_with_fallback(client: "openai.OpenAI", batch_texts: List[str], target_language: str, model: str, established_terms: Mapping[str, str], pacer: _RequestPacer, batch_start: int, in_flight: Optional[threading.BoundedSemaphore] = None, fallback_workers: int = 1) -> List[str]:
+    """
+    Translate one batch, falling back to individual translation if the batch request fails
+    
+    Args:
+        client: OpenAI client instance
+        batch_texts: Texts in this batch
+        target_language: Target language
+        model: GPT-5 model to use
+        established_terms: Read-only snapshot of established term translations for this batch
+        pacer: Shared request limiter (also paces the individual fallback requests and retries)
+        batch_start: Index of the batch's first text (for logging)
+        in_flight: Semaphore held around each request, shared with the other batches so
+            the fallback pools cannot push concurrent requests past its bound (optional)
+        fallback_workers: Maximum number of individual fallback requests in flight at once
+        
+    Returns:
+        List of translated texts in the same order as input
+    """
+    if in_flight is None:
+        in_flight = nullcontext()
+    
+    try:
+        with in_flight:
+            return _translate_batch(client, batch_texts, target_language, model, established_terms, pacer)
+    except Exception as e:
+        logger.error("Batch translation failed for batch starting at %s: %s", batch_start, e)
+        
+        # Fallback to individual translation for this batch
+        def translate_one(text: str) -> str:
+            try:
+                with in_flight:
+                    return _translate_single(client, text, target_language, model, pacer)
+            except Exception as single_e:
+                logger.error("Failed to translate text '%s': %s", text, single_e)
+                return text  # Use original text if all fails
+        
+        workers = min(fallback_workers, len(batch_texts))
+        if workers <= 1:
+            return [translate_one(text) for text in batch_texts]
+        
+        # The individual requests are independent, so send them concurrently (map keeps input order);
+        # in_flight keeps the total across every batch's fallback pool within max_workers
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(translate_one, batch_texts))
+
+
+def _translate_single(client: "openai.OpenAI", text: str, target_language: str, model: str, pacer: Optional[_RequestPacer] = None) -> str:
     """
     Translate a single text using GPT-5 Responses API
     
@@ -147,6 +477,7 @@ def _translate_single(client: openai.OpenAI, text: str, target_language: str, mo
         text: Single text to translate
         target_language: Target language
         model: GPT-5 model to use
+        pacer: Request limiter each attempt waits for (optional)
         
     Returns:
         Translated text
@@ -175,7 +506,7 @@ def _translate_single(client: openai.OpenAI, text: str, target_language: str, mo
         }
         
         # Make API call using Chat Completions API
-        response = client.chat.completions.create(**api_params)
+        response = _create_chat_completion(client, pacer, [text], **api_params)
         
         # Parse response from Chat Completions API
         translated_content = response.choices[0].message.content.strip()
@@ -184,11 +515,51 @@ def _translate_single(client: openai.OpenAI, text: str, target_language: str, mo
         return translated_content if translated_content else text
         
     except Exception as e:
-        logging.error(f"Single translation failed: {str(e)}")
+        logger.error("Single translation failed: %s", e)
         return text  # Return original if translation fails
 
 
-def _translate_batch(client: openai.OpenAI, texts: List[str], target_language: str, model: str, established_terms: Dict[str, str] = None) -> List[str]:
+def _build_batch_request_params(texts: List[str], target_language: str, model: str, established_terms: Mapping[str, str] = None) -> Dict:
+    """
+    Build Chat Completions parameters for translating a numbered batch of texts
+    
+    Args:
+        texts: List of texts to translate
+        target_language: Target language
+        model: GPT-5 model to use
+        established_terms: Dictionary of previously established term translations
+        
+    Returns:
+        Keyword arguments for client.chat.completions.create
+    """
+    # Create numbered batch for clear parsing (join makes a list of a generator anyway, so pass one)
+    batch_content = "\n".join([f"{i}. {text}" for i, text in enumerate(texts, 1)])
+    
+    # Get prompts from centralized prompt manager (context-aware if terms available)
+    if established_terms:
+        prompts = SubtitlePrompts.get_context_aware_batch_prompt(target_language, established_terms)
+    else:
+        prompts = SubtitlePrompts.get_batch_translation_prompt(target_language)
+    
+    system_prompt = prompts["system"]
+    user_prompt = prompts["user_template"].format(target_language=target_language, batch_content=batch_content)
+    
+    return {
+        "model": model,
+        "messages": [
+            {
+                "role": "system",
+                "content": system_prompt
+            },
+            {
+                "role": "user", 
+                "content": user_prompt
+            }
+        ]
+    }
+
+
+def _translate_batch(client: "openai.OpenAI", texts: List[str], target_language: str, model: str, established_terms: Mapping[str, str] = None, pacer: Optional[_RequestPacer] = None) -> List[str]:
     """
     Translate multiple texts in a single batch for better consistency
     
@@ -198,44 +569,17 @@ def _translate_batch(client: openai.OpenAI, texts: List[str], target_language: s
         target_language: Target language
         model: GPT-5 model to use
         established_terms: Dictionary of previously established term translations
+        pacer: Request limiter each attempt waits for (optional)
         
     Returns:
         List of translated texts in the same order as input
     """
     
     try:
-        # Create numbered batch for clear parsing
-        numbered_texts = []
-        for i, text in enumerate(texts, 1):
-            numbered_texts.append(f"{i}. {text}")
-        
-        batch_content = "\n".join(numbered_texts)
-        
-        # Get prompts from centralized prompt manager (context-aware if terms available)
-        if established_terms:
-            prompts = SubtitlePrompts.get_context_aware_batch_prompt(target_language, established_terms)
-        else:
-            prompts = SubtitlePrompts.get_batch_translation_prompt(target_language)
-        
-        system_prompt = prompts["system"]
-        user_prompt = prompts["user_template"].format(target_language=target_language, batch_content=batch_content)
+        api_params = _build_batch_request_params(texts, target_language, model, established_terms)
         
         # Make batch API call
-        api_params = {
-            "model": model,
-            "messages": [
-                {
-                    "role": "system",
-                    "content": system_prompt
-                },
-                {
-                    "role": "user", 
-                    "content": user_prompt
-                }
-            ]
-        }
-        
-        response = client.chat.completions.create(**api_params)
+        response = _create_chat_completion(client, pacer, texts, **api_params)
         translated_content = response.choices[0].message.content.strip()
         
         # Parse the numbered response
@@ -244,7 +588,7 @@ def _translate_batch(client: openai.OpenAI, texts: List[str], target_language: s
         return translations
         
     except Exception as e:
-        logging.error(f"Batch translation failed: {str(e)}")
+        logger.error("Batch translation failed: %s", e)
         raise e
 
 
@@ -262,55 +606,35 @@ def _parse_batch_response(response_text: str, expected_count: int) -> List[str]:
     
     response_text = response_text.strip()
     
+    # One scan for numbered lines like "1. translation" or "1) translation"; the first line for a number wins
+    numbered = {}
+    for match in _NUMBERED_LINE.finditer(response_text):
+        numbered.setdefault(int(match.group(1)), match.group(2))
+    
     # Handle single translation case (for backward compatibility with tests)
     if expected_count == 1:
         # If it's just a single response without numbering, return it as-is
-        lines = response_text.split('\n')
-        if len(lines) == 1 or not any(line.strip().startswith(('1.', '1)')) for line in lines):
+        if '\n' not in response_text or 1 not in numbered:
             return [response_text]
     
-    # Handle numbered batch format
-    lines = response_text.split('\n')
     translations = []
-    
+    lines = None
     for i in range(1, expected_count + 1):
-        found = False
-        for line in lines:
-            line = line.strip()
-            # Look for numbered format like "1. translation" or "1) translation"
-            if line.startswith(f"{i}.") or line.startswith(f"{i})"):
-                # Extract the translation part after the number and separator
-                if '.' in line:
-                    translation = line.split('.', 1)[1].strip()
-                else:
-                    translation = line.split(')', 1)[1].strip()
-                translations.append(translation)
-                found = True
-                break
-        
-        if not found:
-            # If numbered format not found, try line-by-line approach
-            if i <= len(lines):
-                line = lines[i-1].strip()
-                # Remove any leading numbers if present
-                if line.startswith(f"{i}.") or line.startswith(f"{i})"):
-                    if '.' in line:
-                        translation = line.split('.', 1)[1].strip()
-                    else:
-                        translation = line.split(')', 1)[1].strip()
-                    translations.append(translation)
-                else:
-                    translations.append(line)
-                found = True
-        
-        if not found:
+        translation = numbered.get(i)
+        if translation is not None:
+            translations.append(translation.strip())
+            continue
+        
+        # Only split into lines when some item came back unnumbered (common responses never do)
+        if lines is None:
+            lines = response_text.split('\n')
+        if i <= len(lines):
+            # If numbered format not found, fall back to the line at the same position
+            translations.append(lines[i-1].strip())
+        else:
             translations.append(f"Translation {i} not found")
     
-    # Ensure we have the right number of translations
-    while len(translations) < expected_count:
-        translations.append(f"Missing translation {len(translations) + 1}")
-    
-    return translations[:expected_count]
+    return translations
 
 
 def translate_with_context_memory(text_list: List[str], target_language: str, api_key: str, model: str = "gpt-5-mini", progress_callback=None) -> Tuple[List[str], ContextManager]:
@@ -335,6 +659,149 @@ def translate_with_context_memory(text_list: List[str], target_language: str, ap
     return translated_texts, context_manager
 
 
+def submit_batch_translation(text_list: List[str], target_language: str, api_key: str, model: str = "gpt-5-mini", batch_size: int = 12) -> str:
+    """
+    Submit a translation job to the OpenAI Batch API (asynchronous, roughly half the cost)
+    
+    Each subtitle batch becomes one request line in an uploaded JSONL file. Results are
+    collected later with collect_batch_translation using the same text_list and batch_size.
+    
+    Args:
+        text_list: List of texts to translate
+        target_language: Target language for translation
+        api_key: OpenAI API key
+        model: GPT-5 model to use
+        batch_size: Maximum number of subtitles per request line (default: 12)
+        
+    Returns:
+        The OpenAI batch job ID
+        
+    Raises:
+        ValueError: If there is nothing to translate
+    """
+    non_empty_texts, _ = _collect_non_empty(text_list)
+    if not non_empty_texts:
+        raise ValueError("No non-empty texts to translate")
+    
+    request_lines = []
+    for batch_index, batch_texts in enumerate(_pack_batches(non_empty_texts, batch_size)):
+        request_lines.append(json.dumps({
+            "custom_id": str(batch_index),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _build_batch_request_params(batch_texts, target_language, model)
+        }, ensure_ascii=False))
+    
+    client = _get_client(api_key)
+    input_file = _call_api(
+        client.files.create,
+        file=("subtitle_batch.jsonl", "\n".join(request_lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch_job = _call_api(
+        client.batches.create,
+        input_file_id=input_file.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h"
+    )
+    return batch_job.id
+
+
+def collect_batch_translation(batch_id: str, text_list: List[str], api_key: str, batch_size: int = 12) -> Tuple[str, Optional[List[str]]]:
+    """
+    Check a Batch API job and assemble its translations once it has completed
+    
+    Args:
+        batch_id: Job ID returned by submit_batch_translation
+        text_list: The same texts that were submitted
+        api_key: OpenAI API key
+        batch_size: The batch size used at submission
+        
+    Returns:
+        Tuple of (job_status, translated_texts). translated_texts is None until the job has
+        completed; texts whose request failed keep their original text.
+    """
+    client = _get_client(api_key)
+    batch_job = _call_api(client.batches.retrieve, batch_id)
+    
+    if batch_job.status != "completed":
+        return batch_job.status, None
+    
+    output = _call_api(client.files.content, batch_job.output_file_id).text if batch_job.output_file_id else None
+    
+    non_empty_texts, text_slots = _collect_non_empty(text_list)
+    batches = _pack_batches(non_empty_texts, batch_size)
+    
+    # Map each custom_id (batch index) to its response content
+    responses = {}
+    if output:
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            response = record.get("response") or {}
+            if response.get("status_code") == 200:
+                # Refusals come back as 200 with null content; those batches keep their original text
+                content = (response["body"]["choices"][0]["message"].get("content") or "").strip()
+                if content:
+                    responses[record["custom_id"]] = content
+    
+    all_translations = []
+    for batch_index, batch_texts in enumerate(batches):
+        content = responses.get(str(batch_index))
+        if content:
+            all_translations.extend(_parse_batch_response(content, len(batch_texts)))
+        else:
+            logger.error("Batch API request %s of job %s failed", batch_index, batch_id)
+            all_translations.extend(batch_texts)  # Use original text if the request failed
+    
+    # Reconstruct the full result list
+    return batch_job.status, _spread_translations(all_translations, text_slots)
+
+
+def wait_for_batch_translation(batch_id: str, text_list: List[str], api_key: str, batch_size: int = 12, poll_interval: float = 10.0, max_poll_interval: float = 300.0, timeout: Optional[float] = None) -> List[str]:
+    """
+    Block until a Batch API job has finished and return its translations (for scripts and other non-interactive use)
+    
+    The job is polled with exponential backoff: the wait between checks starts at poll_interval
+    and doubles up to max_poll_interval, since jobs take minutes to hours to complete.
+    
+    Args:
+        batch_id: Job ID returned by submit_batch_translation
+        text_list: The same texts that were submitted
+        api_key: OpenAI API key
+        batch_size: The batch size used at submission
+        poll_interval: Seconds to wait before the second status check
+        max_poll_interval: Upper bound on the wait between status checks
+        timeout: Give up after this many seconds (default: wait indefinitely)
+        
+    Returns:
+        List of translated texts in the same order as input
+        
+    Raises:
+        RuntimeError: If the job failed, expired or was cancelled
+        TimeoutError: If the job has not completed within timeout
+    """
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    interval = poll_interval
+    
+    while True:
+        status, translated_texts = collect_batch_translation(batch_id, text_list, api_key, batch_size)
+        if translated_texts is not None:
+            return translated_texts
+        if status in BATCH_FAILED_STATUSES:
+            raise RuntimeError(f"Batch job {batch_id} {status}")
+        
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Batch job {batch_id} still {status} after {timeout} seconds")
+            interval = min(interval, remaining)
+        
+        time.sleep(interval)
+        interval = min(interval * 2, max_poll_interval)
+
+
 def estimate_translation_cost(text_list: List[str], target_language: str, model: str = "gpt-5-mini") -> Dict[str, any]:
     """
     Estimate the cost of translating given texts
@@ -348,19 +815,10 @@ def estimate_translation_cost(text_list: List[str], target_language: str, model:
         Dictionary with cost estimation details
     """
     
-    if not text_list:
-        return {
-            "total_characters": 0,
-            "estimated_input_tokens": 0,
-            "estimated_output_tokens": 0,
-            "estimated_cost_usd": 0.0,
-            "total_texts": 0,
-            "model": model
-        }
-    
-    # Calculate total characters for non-empty texts
-    total_chars = sum(len(text) for text in text_list if text and text.strip())
+    # Calculate total characters and count of non-empty texts in one pass
+    total_chars, total_texts = _count_non_empty(text_list)
     
+    # Nothing to translate (empty list or only blank texts)
     if total_chars == 0:
         return {
             "total_characters": 0,
@@ -376,15 +834,8 @@ def estimate_translation_cost(text_list: List[str], target_language: str, model:
     estimated_input_tokens = max(1, total_chars // char_per_token)
     estimated_output_tokens = estimated_input_tokens  # Assume similar length output
     
-    # Get pricing for supported GPT-5 models (Updated January 2025)
-    # Prices are per 1K tokens (converted from per million tokens)
-    pricing_map = {
-        "gpt-5": {"input": 0.00125, "output": 0.01},        # $1.25/$10.00 per million
-        "gpt-5-mini": {"input": 0.00025, "output": 0.002},  # $0.25/$2.00 per million
-    }
-    
     # Get pricing for the specified model
-    pricing = pricing_map.get(model, pricing_map["gpt-5-mini"])  # Default to mini if not found
+    pricing = _PRICING_MAP.get(model, _PRICING_MAP["gpt-5-mini"])  # Default to mini if not found
     
     # Calculate costs (prices are per 1K tokens)
     input_cost = (estimated_input_tokens / 1000) * pricing["input"]
@@ -399,6 +850,6 @@ def estimate_translation_cost(text_list: List[str], target_language: str, model:
         "estimated_input_tokens": estimated_input_tokens,
         "estimated_output_tokens": estimated_output_tokens,
         "estimated_cost_usd": total_cost,
-        "total_texts": len([t for t in text_list if t and t.strip()]),
+        "total_texts": total_texts,
         "model": model
     }
\ No newline at end of file